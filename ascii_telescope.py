@@ -9,26 +9,27 @@ directly in your terminal using ASCII character mapping.
 Usage: python telescope.py
 """
 
-import io
+import importlib.util
+import queue
+import threading
 import time
 import sys
 from typing import Optional, Dict, Any
 
-import cv2
 import numpy as np
 import requests
-from PIL import Image
+from requests.adapters import HTTPAdapter
 
 # Configuration - Multiple sources for reliability
 SOURCES = [
     {
         'name': 'NASA SDO HMI Continuum',
-        'url': 'https://sdo.gsfc.nasa.gov/assets/img/latest/latest_1024_hmiic.jpg',
+        'url': 'https://sdo.gsfc.nasa.gov/assets/img/latest/latest_256_hmiic.jpg',
         'type': 'jpg'
     },
     {
         'name': 'NASA SDO HMI Magnetogram', 
-        'url': 'https://sdo.gsfc.nasa.gov/assets/img/latest/latest_1024_hmib.jpg',
+        'url': 'https://sdo.gsfc.nasa.gov/assets/img/latest/latest_256_hmib.jpg',
         'type': 'jpg'
     },
     {
@@ -43,93 +44,247 @@ WIDTH = 80
 HEIGHT = 24
 ASCII_CHARS = " .:-=+*#%@"
 
+# 256-entry byte lookup table mapping 8-bit brightness to ASCII_CHARS
+# (backed by a bytearray so it is writable and matches the Numba kernel signature)
+_LUT = np.frombuffer(
+    bytearray("".join(ASCII_CHARS[v * (len(ASCII_CHARS) - 1) // 255] for v in range(256)), "ascii"),
+    dtype=np.uint8,
+)
+
+# Reusable output buffer for resizing the cropped view
+_SCRATCH = np.empty((HEIGHT, WIDTH), dtype=np.uint8)
+
+# Output text buffer, one row per line with the last column preset to newlines
+_LINES = np.empty((HEIGHT, WIDTH + 1), dtype=np.uint8)
+_LINES[:, WIDTH] = ord("\n")
+
+# Guards the shared buffers above, since racing fetch threads convert concurrently
+_CONVERT_LOCK = threading.Lock()
+
+def _chars_kernel(image, lut, out):
+    """Map each pixel of a HEIGHT x WIDTH 8-bit image through lut into out"""
+    # Numba freezes module globals as compile-time constants, so these
+    # bounds are literals and the fixed-size loops can be unrolled
+    for i in range(HEIGHT):
+        for j in range(WIDTH):
+            out[i, j] = lut[image[i, j]]
+    return out
+
+# Compiled _chars_kernel, built on the first fallback call so importing
+# numba never slows down startup
+_to_chars = None
+
+def _load_to_chars():
+    """Compile the LUT kernel with Numba on first use, or return None without it"""
+    global _to_chars
+    if _to_chars is None:
+        try:
+            from numba import njit
+        except ImportError:  # Optional, only used by the LUT fallback
+            return None
+    
+        # Explicit signature compiles once (or loads from cache) instead of per call type
+        _to_chars = njit('u1[:, ::1](u1[:, ::1], u1[::1], u1[:, ::1])', cache=True,
+                         fastmath=True, boundscheck=False)(_chars_kernel)
+    return _to_chars
+
+# Shared HTTP session so connections are kept alive between refreshes,
+# with a pooled connection per source so parallel fetches can reuse them too
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=len(SOURCES), pool_maxsize=len(SOURCES), max_retries=1))
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+})
+
+# Last response validators per URL: url -> (etag, last_modified, ASCII art)
+_etags: Dict[str, tuple[Optional[str], Optional[str], str]] = {}
+
+# OpenCV, imported on first use to keep startup fast
+_cv2 = None
+
+def _load_cv2():
+    """Import OpenCV on first use and cache the module"""
+    global _cv2
+    if _cv2 is None:
+        import cv2
+        _cv2 = cv2
+    return _cv2
+
 def clear_screen():
     """Clear terminal screen"""
     print("\033[2J\033[H", end="")
 
-def fetch_latest_image() -> Optional[tuple[np.ndarray, str]]:
-    """Fetch the latest solar image from available sources"""
+def _fetch_one(source: Dict[str, Any], cancel: threading.Event) -> Optional[tuple[str, str]]:
+    """Fetch the latest image from a single source as ASCII art
     
-    for source in SOURCES:
-        try:
-            print(f"Trying {source['name']}...")
-            
-            # Add headers to avoid blocking
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            response = requests.get(source['url'], timeout=30, headers=headers)
+    Gives up early, returning None, once cancel is set because a
+    higher-priority source has answered.
+    """
+    try:
+        cv2 = _load_cv2()
+        print(f"Trying {source['name']}...")
+        
+        # Ask the server to skip the body if the image is unchanged
+        headers = {}
+        cached = _etags.get(source['url'])
+        if cached is not None:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        response = _SESSION.get(source['url'], timeout=(5, 30), headers=headers, stream=True)
+        with response:
+            if response.status_code == 304 and cached is not None:
+                print(f"{source['name']} unchanged, reusing cached ASCII art")
+                return cached[2], source['name']
             response.raise_for_status()
             
-            # Handle different image formats
-            if source['type'] in ['jpg', 'jpeg', 'png']:
-                # Load image using PIL
-                image = Image.open(io.BytesIO(response.content))
-                # Convert to grayscale numpy array
-                if image.mode != 'L':
-                    image = image.convert('L')
-                data = np.array(image, dtype=np.float32)
-                
-            else:
-                print(f"Unsupported format: {source['type']}")
-                continue
-            
-            # Validate image data
-            if data is None or data.size == 0:
-                print(f"No valid image data from {source['name']}")
-                continue
-                
-            # Handle any NaN values
-            data = np.nan_to_num(data, nan=0.0)
-            
-            # Crop to central square to avoid artifacts
-            h, w = data.shape
-            side = min(h, w)
-            y0, x0 = (h - side) // 2, (w - side) // 2
-            cropped = data[y0:y0 + side, x0:x0 + side]
-            
-            print(f"Successfully loaded from {source['name']}")
-            return cropped, source['name']
+            # Read the body in chunks so we can stop once a higher-priority source has answered
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                if cancel.is_set():
+                    return None
+                body.extend(chunk)
+        
+        # Handle different image formats
+        if source['type'] in ['jpg', 'jpeg', 'png']:
+            # Decode straight to a grayscale uint8 array
+            buf = np.frombuffer(body, dtype=np.uint8)
+            data = cv2.imdecode(buf, cv2.IMREAD_GRAYSCALE)
+        
+        else:
+            print(f"Unsupported format: {source['type']}")
+            return None
+        
+        # Validate image data
+        if data is None or data.size == 0:
+            print(f"No valid image data from {source['name']}")
+            return None
+        
+        # Crop to central square to avoid artifacts
+        h, w = data.shape
+        side = min(h, w)
+        y0, x0 = (h - side) // 2, (w - side) // 2
+        cropped = data[y0:y0 + side, x0:x0 + side]
+        
+        # Raises on failure, so a broken frame is never cached or shown
+        with _CONVERT_LOCK:
+            ascii_art = image_to_ascii(cropped)
+        
+        # Remember validators and the rendered frame for the next conditional request
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            _etags[source['url']] = (etag, last_modified, ascii_art)
+        
+        print(f"Successfully loaded from {source['name']}")
+        return ascii_art, source['name']
+    
+    except requests.RequestException as e:
+        print(f"Network error with {source['name']}: {e}")
+        return None
+    except Exception as e:
+        print(f"Error processing {source['name']}: {e}")
+        return None
+
+def _fetch_into(results: queue.Queue, index: int, source: Dict[str, Any], cancel: threading.Event):
+    """Fetch a single source and report the result tagged with its priority"""
+    results.put((index, _fetch_one(source, cancel)))
+
+def fetch_latest_image() -> Optional[tuple[str, str]]:
+    """Fetch the latest solar image as ASCII art from the first working source
+    
+    All sources are queried at once so a dead one is skipped quickly, but a
+    result is only used once every source listed before it has failed.
+    """
+    results = queue.Queue()
+    cancels = [threading.Event() for _ in SOURCES]
+    
+    # Daemon threads, so an in-flight request never holds up Ctrl+C
+    for index, source in enumerate(SOURCES):
+        threading.Thread(target=_fetch_into, args=(results, index, source, cancels[index]),
+                         daemon=True).start()
+    
+    outcomes = {}
+    winner = None
+    deadline = time.monotonic() + 30
+    try:
+        while winner is None and len(outcomes) < len(SOURCES):
+            index, result = results.get(timeout=max(deadline - time.monotonic(), 0))
+            outcomes[index] = result
             
-        except requests.RequestException as e:
-            print(f"Network error with {source['name']}: {e}")
-            continue
-        except Exception as e:
-            print(f"Error processing {source['name']}: {e}")
-            continue
+            # Walk the sources in priority order, stopping at one still running
+            for i in range(len(SOURCES)):
+                if i not in outcomes:
+                    break
+                if outcomes[i] is not None:
+                    winner = i
+                    break
+    
+    except queue.Empty:
+        print("Timed out waiting for sources")
+        # Settle for the highest-priority source that did answer
+        winner = next((i for i in sorted(outcomes) if outcomes[i] is not None), None)
+    
+    if winner is None:
+        print("All sources failed!")
+        return None
+    
+    # Tell lower-priority sources still downloading to drop their connection
+    for cancel in cancels[winner + 1:]:
+        cancel.set()
     
-    print("All sources failed!")
-    return None
+    return outcomes[winner]
+
+def lut_fallback(image: np.ndarray) -> np.ndarray:
+    """Apply the character LUT without OpenCV"""
+    to_chars = _load_to_chars()
+    if to_chars is None or image.shape != (HEIGHT, WIDTH):
+        return _LUT[image]
+    
+    out = np.empty(image.shape, dtype=np.uint8)
+    return to_chars(image, _LUT, out)
 
 def image_to_ascii(image: np.ndarray) -> str:
-    """Convert image to ASCII art"""
+    """Convert a uint8 grayscale image to ASCII art
+    
+    Errors propagate so callers don't mistake a failed frame for a real one.
+    """
+    cv2 = _load_cv2()
+    
+    # Resize the cropped view straight into the scratch buffer
+    resized = cv2.resize(image, (WIDTH, HEIGHT), dst=_SCRATCH, interpolation=cv2.INTER_AREA)
+    
+    # Stretch to the full 0-255 range in place, staying in uint8
+    normalized = cv2.normalize(resized, resized, alpha=0, beta=255,
+                               norm_type=cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+    
+    # Convert to ASCII
     try:
-        # Resize image
-        resized = cv2.resize(image, (WIDTH, HEIGHT))
-        
-        # Normalize to 0-1 range
-        img_min, img_max = resized.min(), resized.max()
-        if img_max > img_min:
-            normalized = (resized - img_min) / (img_max - img_min)
-        else:
-            normalized = np.zeros_like(resized)
-        
-        # Convert to ASCII
-        ascii_image = []
-        for row in normalized:
-            ascii_row = ""
-            for pixel in row:
-                char_index = int(pixel * (len(ASCII_CHARS) - 1))
-                char_index = max(0, min(char_index, len(ASCII_CHARS) - 1))
-                ascii_row += ASCII_CHARS[char_index]
-            ascii_image.append(ascii_row)
+        chars = cv2.LUT(normalized, _LUT)
+    except cv2.error:
+        chars = lut_fallback(normalized)
+    _LINES[:, :WIDTH] = chars
+    return _LINES.tobytes()[:-1].decode("ascii")
+
+def fetch_worker(frames: queue.Queue):
+    """Fetch images in the background and hand them to the display loop"""
+    while True:
+        try:
+            result = fetch_latest_image()
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            print("Retrying in 30 seconds...")
+            time.sleep(30)
+            continue
         
-        return "\n".join(ascii_image)
+        # Blocks until the display loop has taken the previous frame
+        frames.put(result)
         
-    except Exception as e:
-        print(f"Error converting to ASCII: {e}")
-        return "Error processing image"
+        # Wait before next update
+        time.sleep(REFRESH_SEC if result is not None else 60)
 
 def run_stream():
     """Main streaming loop"""
@@ -139,15 +294,21 @@ def run_stream():
     
     current_source = "Unknown"
     
+    # Fetch and convert on a background thread so the display never waits on I/O
+    frames = queue.Queue(maxsize=1)
+    threading.Thread(target=fetch_worker, args=(frames,), daemon=True).start()
+    
     while True:
         try:
-            # Fetch and process image
-            result = fetch_latest_image()
+            # Poll so Ctrl+C is handled promptly on every platform
+            try:
+                result = frames.get(timeout=1)
+            except queue.Empty:
+                continue
             
             if result is not None:
-                image, source_name = result
+                ascii_art, source_name = result
                 current_source = source_name
-                ascii_art = image_to_ascii(image)
                 
                 # Clear screen and display
                 clear_screen()
@@ -161,35 +322,18 @@ def run_stream():
                 print("Press Ctrl+C to exit")
             else:
                 print("Failed to fetch image from all sources, retrying in 60 seconds...")
-                time.sleep(60)
-                continue
-                
+        
         except KeyboardInterrupt:
             print("\nShutting down telescope...")
             sys.exit(0)
         except Exception as e:
             print(f"Unexpected error: {e}")
-            print("Retrying in 30 seconds...")
-            time.sleep(30)
-            continue
-        
-        # Wait before next update
-        try:
-            time.sleep(REFRESH_SEC)
-        except KeyboardInterrupt:
-            print("\nShutting down telescope...")
-            sys.exit(0)
 
 if __name__ == "__main__":
-    # Check dependencies
-    try:
-        import cv2
-        import numpy as np
-        import requests
-        from PIL import Image
-    except ImportError as e:
-        print(f"Missing dependency: {e}")
-        print("Install with: pip install opencv-python numpy requests pillow")
+    # OpenCV is imported lazily, so check it is installed without loading it
+    if importlib.util.find_spec("cv2") is None:
+        print("Missing dependency: No module named 'cv2'")
+        print("Install with: pip install opencv-python numpy requests")
         sys.exit(1)
     
     run_stream()